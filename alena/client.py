@@ -28,37 +28,53 @@ def send_task(args: 'Namespace', s: 'socket') -> None:
 def post_task_simple(args: 'Namespace') -> None:
     with closing(connect(args)) as s:
         send_task(args, s)
-        task_id = Message.recv(s).task_id
+        response = Message.recv(s)
+    if response.status == Status.THROTTLED:
+        logging.info('Task THROTTLED by server')
+        return
+    task_id = response.task_id
     logging.info('Monitoring task with task_id {}'.format(task_id))
+    completed = False
     while True:
-        with closing(connect(args)) as s:
-            Message(command=Command.CS_GET_TASK_STATUS, task_id=task_id).send(s)
-            status = Message.recv(s).status
-        if status == Status.NOT_FOUND:
-            logging.info('Task with task_id {} not found'.format(task_id))
-            return
-        elif status == Status.QUEUE:
-            logging.info('Task with task_id {} now in queue'.format(task_id))
-        elif status == Status.PROGRESS:
-            logging.info('Task with task_id {} now in progress'.format(task_id))
-        elif status == Status.COMPLETED:
-            logging.info('Task with task_id {} completed'.format(task_id))
+        if not completed:
+            with closing(connect(args)) as s:
+                Message(command=Command.CS_GET_TASK_STATUS, task_id=task_id).send(s)
+                status = Message.recv(s).status
+            if status == Status.NOT_FOUND:
+                logging.info('Task with task_id {} not found'.format(task_id))
+                return
+            elif status == Status.QUEUE:
+                logging.info('Task with task_id {} now in queue'.format(task_id))
+            elif status == Status.PROGRESS:
+                logging.info('Task with task_id {} now in progress'.format(task_id))
+            elif status == Status.THROTTLED:
+                logging.info('Status request for task with task_id {} throttled'.format(task_id))
+            elif status == Status.COMPLETED:
+                logging.info('Task with task_id {} completed'.format(task_id))
+                completed = True
+        if completed:
             with closing(connect(args)) as s:
                 Message(command=Command.CS_GET_TASK_RESULT, task_id=task_id).send(s)
                 result = Message.recv(s)
             if result.status == Status.NOT_FOUND:
                 logging.info('Result for task with task_id {} not found'.format(task_id))
+                return
+            elif result.status == Status.THROTTLED:
+                logging.info('Result request for task with task_id {} throttled'.format(task_id))
             else:
                 logging.info('Result for task with task_id {} is {}'.format(task_id, result.message))
-            return
+                return
         sleep(1)
 
 
 def post_task_packet(args: 'Namespace') -> None:
     with closing(connect(args)) as s:
         send_task(args, s)
-        task_id = Message.recv(s).task_id
-        logging.info('New task have task_id {}'.format(task_id))
+        response = Message.recv(s)
+        if response.status == Status.THROTTLED:
+            logging.info('Task THROTTLED by server')
+        else:
+            logging.info('New task have task_id {}'.format(response.task_id))
 
 
 def post_task(args: 'Namespace') -> None:
@@ -77,6 +93,7 @@ def status_task(args: 'Namespace') -> None:
         Status.QUEUE: 'Task with task_id {} in QUEUE',
         Status.PROGRESS: 'Task with task_id {} in PROGRESS',
         Status.COMPLETED: 'Task with task_id {} COMPLETED',
+        Status.THROTTLED: 'Status request for task with task_id {} THROTTLED',
     }
     with closing(connect(args)) as s:
         Message(command=Command.CS_GET_TASK_STATUS, task_id=args.task_id).send(s)
@@ -90,6 +107,8 @@ def result_task(args: 'Namespace') -> None:
         result = Message.recv(s)
         if result.status == Status.NOT_FOUND:
             logging.info('Result for task with task_id {} NOT FOUND'.format(args.task_id))
+        elif result.status == Status.THROTTLED:
+            logging.info('Result request for task with task_id {} THROTTLED'.format(args.task_id))
         else:
             logging.info('Result for task with task_id {} is {}'.format(args.task_id, result.message))
 
@@ -0,0 +1,138 @@
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, Hashable
+
+
+class TokenBucket:
+    """Token bucket, refilled lazily on every take"""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        """Take one token from bucket
+
+        :param now: Current monotonic time
+        :return: True if token was taken, False if bucket is empty
+        """
+        self._refill(now)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def full(self, now: float) -> bool:
+        """Check bucket refilled to burst
+
+        :param now: Current monotonic time
+        :return: True if bucket is full
+        """
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class TokenBuckets:
+    """Token buckets by client, full buckets dropped by amortized sweep"""
+    SWEEP_SIZE = 1024
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = dict()  # type: Dict[Hashable, TokenBucket]
+        self._sweep_at = self.SWEEP_SIZE
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _sweep(self, now: float) -> None:
+        for client in [client for client, bucket in self._buckets.items() if bucket.full(now)]:
+            del self._buckets[client]
+        self._sweep_at = max(self.SWEEP_SIZE, 2 * len(self._buckets))
+
+    def take(self, client: Hashable, now: float) -> bool:
+        """Take one token from client bucket
+
+        :param client: Client identifier (e.g. IP address)
+        :param now: Current monotonic time
+        :return: True if token was taken, False if bucket is empty
+        """
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self._sweep_at:
+                self._sweep(now)
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+        return bucket.take(now)
+
+
+class ClientLimiter:
+    """Per-client admission control: rate of posts, rate of queries and count of tasks in flight
+
+    Rate or in flight limit equal to 0 disables corresponding check.
+    """
+
+    def __init__(self, post_rate: float = 0, post_burst: float = 1, query_rate: float = 0, query_burst: float = 2,
+                 max_in_flight: int = 0, clock: Callable[[], float] = monotonic):
+        if post_rate < 0 or query_rate < 0:
+            raise ValueError('rate must be non-negative')
+        if post_burst < 1 or query_burst < 1:
+            raise ValueError('burst must be at least 1')
+        if max_in_flight < 0:
+            raise ValueError('max_in_flight must be non-negative')
+        self.post_rate = post_rate
+        self.query_rate = query_rate
+        self.max_in_flight = max_in_flight
+        self.clock = clock
+        self._lock = Lock()
+        self._post_buckets = TokenBuckets(post_rate, post_burst)
+        self._query_buckets = TokenBuckets(query_rate, query_burst)
+        self._in_flight = dict()    # type: Dict[Hashable, int]
+
+    def admit_post(self, client: Hashable) -> bool:
+        """Check limits for new task and reserve in flight slot on success
+
+        :param client: Client identifier (e.g. IP address)
+        :return: True if task admitted, False if client throttled
+        """
+        with self._lock:
+            in_flight = self._in_flight.get(client, 0)
+            if self.max_in_flight and in_flight >= self.max_in_flight:
+                return False
+            if self.post_rate and not self._post_buckets.take(client, self.clock()):
+                return False
+            self._in_flight[client] = in_flight + 1
+            return True
+
+    def admit_query(self, client: Hashable) -> bool:
+        """Check limits for status or result query
+
+        :param client: Client identifier (e.g. IP address)
+        :return: True if query admitted, False if client throttled
+        """
+        if not self.query_rate:
+            return True
+        with self._lock:
+            return self._query_buckets.take(client, self.clock())
+
+    def release(self, client: Hashable) -> None:
+        """Free in flight slot reserved by admit_post
+
+        :param client: Client identifier (e.g. IP address)
+        :return: None
+        """
+        with self._lock:
+            in_flight = self._in_flight.get(client, 0)
+            if in_flight <= 1:
+                self._in_flight.pop(client, None)
+            else:
+                self._in_flight[client] = in_flight - 1
+
+    def in_flight(self, client: Hashable) -> int:
+        with self._lock:
+            return self._in_flight.get(client, 0)
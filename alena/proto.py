@@ -32,6 +32,9 @@ S->C
 SC_GET_TASK_RESULT
 - message
 
+Any C->S request may be answered with status THROTTLED when client exceeds
+server limits: SC_GET_TASK_RESULT for CS_GET_TASK_RESULT, SC_GET_TASK_STATUS otherwise.
+
 """
 
 
@@ -50,6 +53,7 @@ class Status(Enum):
     PROGRESS = 1
     COMPLETED = 2
     NOT_FOUND = 3
+    THROTTLED = 4
 
 
 class Message:
@@ -5,6 +5,7 @@ from contextlib import suppress
 from queue import Queue
 from threading import Thread
 
+from .limits import ClientLimiter
 from .proto import Command, Status, Message
 from .workers import TaskType, worker_table
 
@@ -12,27 +13,39 @@ from .workers import TaskType, worker_table
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
 task_database = dict(last_task_index=0, task=dict())    # Best choice - use real database (e.g. PostgreSQL)
 task_queue = Queue()                                    # Best choice - use real message broker (e.g. RabbitMQ)
+client_limiter = ClientLimiter()                        # Unlimited until configured in main
+
+
+def process_task() -> None:
+    """Take one task from queue and process it"""
+    task_id = task_queue.get()
+    task = task_database['task'][task_id]
+    task['status'] = Status.PROGRESS
+    logging.info('WORKER/PROCESS/{}'.format(task_id))
+    task['message'] = worker_table[task['command']](task['message'])
+    task['status'] = Status.COMPLETED
+    client_limiter.release(task['client'])
+    logging.info('WORKER/COMPLETED/{}'.format(task_id))
 
 
 def worker() -> None:
     """Worker thread"""
     while True:
-        task_id = task_queue.get()
-        task = task_database['task'][task_id]
-        task['status'] = Status.PROGRESS
-        logging.info('WORKER/PROCESS/{}'.format(task_id))
-        task['message'] = worker_table[task['command']](task['message'])
-        task['status'] = Status.COMPLETED
-        logging.info('WORKER/COMPLETED/{}'.format(task_id))
+        process_task()
 
 
 class TCPHandler(BaseRequestHandler):
     TIMEOUT = 3
 
+    @property
+    def _client(self) -> str:
+        return self.client_address[0]
+
     def _handle_post_task(self, task_type: 'TaskType', data: str) -> None:
         logging.info('POST_TASK/{}/{}'.format(task_type.name, data))
         task_id = task_database['last_task_index']
-        task_database['task'][task_id] = dict(command=task_type, status=Status.QUEUE, message=data)
+        task_database['task'][task_id] = dict(command=task_type, status=Status.QUEUE, message=data,
+                                              client=self._client)
         task_database['last_task_index'] += 1
         task_queue.put_nowait(task_id)
         Message(command=Command.SC_POST_TASK, task_id=task_id).send(self.request)
@@ -55,8 +68,24 @@ class TCPHandler(BaseRequestHandler):
         except (KeyError, ValueError):
             Message(command=Command.SC_GET_TASK_RESULT, status=Status.NOT_FOUND, message='').send(self.request)
 
+    def _handle_throttled(self, command: 'Command') -> None:
+        logging.info('THROTTLED/{}/{}'.format(command.name, self._client))
+        if command == Command.CS_GET_TASK_RESULT:
+            Message(command=Command.SC_GET_TASK_RESULT, status=Status.THROTTLED, message='').send(self.request)
+        else:
+            Message(command=Command.SC_GET_TASK_STATUS, status=Status.THROTTLED).send(self.request)
+
+    def _admit(self, message: 'Message') -> bool:
+        if message.command in (Command.CS_POST_TASK_REVERSE, Command.CS_POST_TASK_TRANSPOSITION):
+            return client_limiter.admit_post(self._client)
+        elif message.command in (Command.CS_GET_TASK_STATUS, Command.CS_GET_TASK_RESULT):
+            return client_limiter.admit_query(self._client)
+        return True
+
     def _handle_message(self, message: 'Message') -> None:
-        if message.command == Command.CS_POST_TASK_REVERSE:
+        if not self._admit(message):
+            self._handle_throttled(message.command)
+        elif message.command == Command.CS_POST_TASK_REVERSE:
             self._handle_post_task(TaskType.REVERSE, message.message)
         elif message.command == Command.CS_POST_TASK_TRANSPOSITION:
             self._handle_post_task(TaskType.TRANSPOSITION, message.message)
@@ -76,7 +105,28 @@ def main() -> None:
     parser.add_argument('bind_addr', help='Bind IP address (127.0.0.1 for local; 0.0.0.0 for public)',
                         metavar='BIND_ADDR')
     parser.add_argument('bind_port', type=int, help='Bind port', metavar='BIND_PORT')
+    parser.add_argument('--post-rate', type=float, default=0, help='Posted tasks per second per client (0 - unlimited)',
+                        metavar='RATE')
+    parser.add_argument('--post-burst', type=float, default=1, help='Posted tasks burst per client', metavar='COUNT')
+    parser.add_argument('--query-rate', type=float, default=0, help='Queries per second per client (0 - unlimited)',
+                        metavar='RATE')
+    parser.add_argument('--query-burst', type=float, default=2,
+                        help='Queries burst per client (below 2 throttles result request right after status request)',
+                        metavar='COUNT')
+    parser.add_argument('--max-in-flight', type=int, default=0,
+                        help='Queued and in progress tasks per client (0 - unlimited)', metavar='COUNT')
     args = parser.parse_args()
+    if args.post_rate < 0 or args.query_rate < 0:
+        parser.error('rate must be non-negative')
+    if args.post_burst < 1 or args.query_burst < 1:
+        parser.error('burst must be at least 1')
+    if args.max_in_flight < 0:
+        parser.error('max in flight must be non-negative')
+
+    global client_limiter
+    client_limiter = ClientLimiter(post_rate=args.post_rate, post_burst=args.post_burst,
+                                   query_rate=args.query_rate, query_burst=args.query_burst,
+                                   max_in_flight=args.max_in_flight)
 
     worker_thread = Thread(target=worker)
     worker_thread.daemon = True
@@ -0,0 +1,58 @@
+from argparse import Namespace
+
+from alena import client
+from alena.limits import ClientLimiter
+from alena.proto import Command, Status
+
+
+class ClockMock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_post_task_simple_result_throttled(monkeypatch):
+    clock = ClockMock()
+    limiter = ClientLimiter(query_rate=1, query_burst=1, clock=clock)
+    requests = []
+
+    class MessageMock:
+        last = None
+
+        def __init__(self, command=None, message=None, status=None, task_id=None):
+            self.command = command
+            self.message = message
+            self.status = status
+            self.task_id = task_id
+
+        def send(self, s):
+            MessageMock.last = self
+
+        @staticmethod
+        def recv(s):
+            command = MessageMock.last.command
+            if command == Command.CS_POST_TASK_REVERSE:
+                return MessageMock(command=Command.SC_POST_TASK, task_id=1)
+            status = Status.COMPLETED if limiter.admit_query('127.0.0.1') else Status.THROTTLED
+            requests.append((command, status))
+            if command == Command.CS_GET_TASK_STATUS:
+                return MessageMock(command=Command.SC_GET_TASK_STATUS, status=status)
+            return MessageMock(command=Command.SC_GET_TASK_RESULT, status=status,
+                               message='ver' if status == Status.COMPLETED else '')
+
+    class SocketMock:
+        def close(self):
+            pass
+
+    monkeypatch.setattr(client, 'Message', MessageMock)
+    monkeypatch.setattr(client, 'connect', lambda args: SocketMock())
+    monkeypatch.setattr(client, 'sleep', clock.sleep)
+    client.post_task_simple(Namespace(reverse=True, transposition=False, message='rev'))
+    assert requests == [(Command.CS_GET_TASK_STATUS, Status.COMPLETED),
+                        (Command.CS_GET_TASK_RESULT, Status.THROTTLED),
+                        (Command.CS_GET_TASK_RESULT, Status.COMPLETED)]
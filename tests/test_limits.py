@@ -0,0 +1,110 @@
+from pytest import fixture, mark, raises
+
+from alena.limits import TokenBucket, TokenBuckets, ClientLimiter
+
+
+@fixture()
+def clock():
+    class ClockMock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    yield ClockMock()
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=1, burst=2, now=0)
+    assert bucket.take(0)
+    assert bucket.take(0)
+    assert not bucket.take(0)
+    assert not bucket.take(0.5)
+    assert bucket.take(1)
+    assert bucket.take(10)
+    assert bucket.take(10)
+    assert not bucket.take(10)
+
+
+def test_admit_post_rate(clock):
+    limiter = ClientLimiter(post_rate=1, post_burst=2, clock=clock)
+    assert limiter.admit_post('a')
+    assert limiter.admit_post('a')
+    assert not limiter.admit_post('a')
+    assert limiter.admit_post('b')
+    clock.now = 1
+    assert limiter.admit_post('a')
+
+
+def test_admit_post_in_flight(clock):
+    limiter = ClientLimiter(max_in_flight=2, clock=clock)
+    assert limiter.admit_post('a')
+    assert limiter.admit_post('a')
+    assert not limiter.admit_post('a')
+    assert limiter.in_flight('a') == 2
+    limiter.release('a')
+    assert limiter.in_flight('a') == 1
+    assert limiter.admit_post('a')
+    limiter.release('a')
+    limiter.release('a')
+    assert limiter.in_flight('a') == 0
+
+
+def test_admit_post_in_flight_not_reserved_when_throttled(clock):
+    limiter = ClientLimiter(post_rate=1, post_burst=1, max_in_flight=5, clock=clock)
+    assert limiter.admit_post('a')
+    assert not limiter.admit_post('a')
+    assert limiter.in_flight('a') == 1
+
+
+def test_admit_query(clock):
+    limiter = ClientLimiter(query_rate=2, query_burst=1, clock=clock)
+    assert limiter.admit_query('a')
+    assert not limiter.admit_query('a')
+    clock.now = 0.5
+    assert limiter.admit_query('a')
+
+
+def test_unlimited():
+    limiter = ClientLimiter()
+    assert all(limiter.admit_post('a') for _ in range(100))
+    assert all(limiter.admit_query('a') for _ in range(100))
+
+
+def test_post_throttled_not_tracked(clock):
+    limiter = ClientLimiter(post_rate=1, post_burst=1, clock=clock)
+    limiter.release('a')
+    assert limiter.in_flight('a') == 0
+    assert 'a' not in limiter._in_flight
+    assert limiter.admit_post('a')
+    limiter.release('a')
+    assert 'a' not in limiter._in_flight
+
+
+def test_full_buckets_swept(monkeypatch, clock):
+    monkeypatch.setattr(TokenBuckets, 'SWEEP_SIZE', 4)
+    limiter = ClientLimiter(query_rate=1, query_burst=1, clock=clock)
+    for client in range(4):
+        assert limiter.admit_query(client)
+    assert len(limiter._query_buckets) == 4
+    clock.now = 1
+    assert limiter.admit_query(4)
+    assert len(limiter._query_buckets) == 1
+
+
+def test_empty_buckets_not_swept(monkeypatch, clock):
+    monkeypatch.setattr(TokenBuckets, 'SWEEP_SIZE', 4)
+    limiter = ClientLimiter(query_rate=1, query_burst=1, clock=clock)
+    for client in range(4):
+        assert limiter.admit_query(client)
+    assert limiter.admit_query(4)
+    assert len(limiter._query_buckets) == 5
+    assert not limiter.admit_query(0)
+
+
+@mark.parametrize('kwargs', [dict(post_rate=-1), dict(query_rate=-1), dict(post_burst=0.5), dict(query_burst=0),
+                             dict(max_in_flight=-1)])
+def test_invalid_limits(kwargs):
+    with raises(ValueError):
+        ClientLimiter(**kwargs)
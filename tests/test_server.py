@@ -1,6 +1,7 @@
 from pytest import fixture
 
 from alena import server
+from alena.limits import ClientLimiter
 from alena.server import TCPHandler, Command, Status, task_database, task_queue, TaskType
 
 
@@ -46,7 +47,7 @@ def test_handle_post_task(monkeypatch):
 
     monkeypatch.setattr(server, 'Message', MessageMock2)
     monkeypatch.setattr(TCPHandler, 'handle', nop)
-    TCPHandler(None, None, None)._handle_post_task(TaskType.REVERSE, 'rev')
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_post_task(TaskType.REVERSE, 'rev')
     task_database['task'].clear()
 
 
@@ -116,32 +117,96 @@ def test_handle_get_task_result_not_found(monkeypatch):
 
 
 def test_handle_message_post(monkeypatch, test_func):
+    monkeypatch.setattr(server, 'client_limiter', ClientLimiter())
     monkeypatch.setattr(TCPHandler, 'handle', nop)
     monkeypatch.setattr(TCPHandler, '_handle_post_task', test_func)
     message = MessageMock(command=Command.CS_POST_TASK_REVERSE, message='Test')
-    TCPHandler(None, None, None)._handle_message(message)
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
     assert test_func.called
     assert test_func.args == (TaskType.REVERSE, 'Test')
     test_func.called = False
     message = MessageMock(command=Command.CS_POST_TASK_TRANSPOSITION, message='Test')
-    TCPHandler(None, None, None)._handle_message(message)
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
     assert test_func.called
     assert test_func.args == (TaskType.TRANSPOSITION, 'Test')
 
 
 def test_handle_message_status(monkeypatch, test_func):
+    monkeypatch.setattr(server, 'client_limiter', ClientLimiter())
     monkeypatch.setattr(TCPHandler, 'handle', nop)
     monkeypatch.setattr(TCPHandler, '_handle_get_task_status', test_func)
     message = MessageMock(command=Command.CS_GET_TASK_STATUS, task_id=1)
-    TCPHandler(None, None, None)._handle_message(message)
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
     assert test_func.called
     assert test_func.args == (1, )
 
 
 def test_handle_message_result(monkeypatch, test_func):
+    monkeypatch.setattr(server, 'client_limiter', ClientLimiter())
     monkeypatch.setattr(TCPHandler, 'handle', nop)
     monkeypatch.setattr(TCPHandler, '_handle_get_task_result', test_func)
     message = MessageMock(command=Command.CS_GET_TASK_RESULT, task_id=1)
-    TCPHandler(None, None, None)._handle_message(message)
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
     assert test_func.called
     assert test_func.args == (1, )
+
+
+def test_handle_message_post_throttled(monkeypatch, test_func):
+    class MessageMock2(MessageMock):
+        def send(self, s):
+            assert self.command == Command.SC_GET_TASK_STATUS
+            assert self.status == Status.THROTTLED
+
+    monkeypatch.setattr(server, 'Message', MessageMock2)
+    monkeypatch.setattr(server, 'client_limiter', ClientLimiter(max_in_flight=1))
+    monkeypatch.setattr(TCPHandler, 'handle', nop)
+    monkeypatch.setattr(TCPHandler, '_handle_post_task', test_func)
+    message = MessageMock(command=Command.CS_POST_TASK_REVERSE, message='Test')
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
+    assert test_func.called
+    test_func.called = False
+    TCPHandler(None, ('127.0.0.1', 2), None)._handle_message(message)
+    assert not test_func.called
+    TCPHandler(None, ('127.0.0.2', 1), None)._handle_message(message)
+    assert test_func.called
+
+
+def test_handle_message_result_throttled(monkeypatch, test_func):
+    class MessageMock2(MessageMock):
+        def send(self, s):
+            assert self.command == Command.SC_GET_TASK_RESULT
+            assert self.status == Status.THROTTLED
+            assert self.message == ''
+
+    monkeypatch.setattr(server, 'Message', MessageMock2)
+    monkeypatch.setattr(server, 'client_limiter', ClientLimiter(query_rate=1, query_burst=1))
+    monkeypatch.setattr(TCPHandler, 'handle', nop)
+    monkeypatch.setattr(TCPHandler, '_handle_get_task_result', test_func)
+    message = MessageMock(command=Command.CS_GET_TASK_RESULT, task_id=1)
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
+    assert test_func.called
+    test_func.called = False
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
+    assert not test_func.called
+
+
+def test_process_task_releases_in_flight(monkeypatch):
+    class MessageMock2(MessageMock):
+        def send(self, s):
+            pass
+
+    monkeypatch.setattr(server, 'Message', MessageMock2)
+    monkeypatch.setattr(server, 'client_limiter', ClientLimiter(max_in_flight=1))
+    monkeypatch.setitem(server.worker_table, TaskType.REVERSE, lambda data: data[::-1])
+    monkeypatch.setattr(TCPHandler, 'handle', nop)
+    message = MessageMock(command=Command.CS_POST_TASK_REVERSE, message='rev')
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
+    assert server.client_limiter.in_flight('127.0.0.1') == 1
+    assert not server.client_limiter.admit_post('127.0.0.1')
+    server.process_task()
+    assert server.client_limiter.in_flight('127.0.0.1') == 0
+    assert task_database['task'][task_database['last_task_index'] - 1]['message'] == 'ver'
+    TCPHandler(None, ('127.0.0.1', 1), None)._handle_message(message)
+    assert server.client_limiter.in_flight('127.0.0.1') == 1
+    server.process_task()
+    task_database['task'].clear()